@@ -0,0 +1,13 @@
+"""Shared FastAPI dependencies for the v1 endpoints."""
+from __future__ import annotations
+
+from digital_twin.database.database_utils import FloodingDatabase, get_shared_database
+
+
+def get_db() -> FloodingDatabase:
+    """Provide the database handle for a request (overridable in tests).
+
+    Returns the pooled process-wide instance rather than opening a new
+    MongoDB client per request.
+    """
+    return get_shared_database()
@@ -20,6 +20,7 @@ from __future__ import annotations
 from datetime import datetime
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field, field_validator
+from api.v1.dependencies import get_db
 from digital_twin.database.database_utils import FloodingDatabase
 from digital_twin.auth.auth import verify_token
 
@@ -62,12 +63,12 @@ class IssueReportResponse(BaseModel):
 
 
 @router.post("/report", response_model=IssueReportResponse, status_code=201, tags=["report"])
-def create_issue_report(req: IssueReportRequest, token: str = Depends(verify_token)):
+def create_issue_report(req: IssueReportRequest, token: str = Depends(verify_token),
+                        db: FloodingDatabase = Depends(get_db)):
     """Create a new issue report.
 
     Authentication: requires a valid bearer token (see `verify_token`).
     """
-    db = FloodingDatabase()
     issue_id = db.create_issue_report(
         issue_type=req.issue_type,
         description=req.description,
@@ -18,6 +18,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 
+from api.v1.dependencies import get_db
 from digital_twin.database.database_utils import FloodingDatabase
 from digital_twin.spatial.spatial_utils import find_catchment_for_point
 from digital_twin.auth.auth import verify_token
@@ -80,7 +81,8 @@ class PointRiskResponse(BaseModel):
 
 
 @router.post("/risk/point", response_model=PointRiskResponse)
-def risk_for_point(request: PointRiskRequest, token: str = Depends(verify_token)):
+def risk_for_point(request: PointRiskRequest, token: str = Depends(verify_token),
+                   db: FloodingDatabase = Depends(get_db)):
     """Assess flood risk for a specific geographic point.
 
     Finds the catchment containing the provided coordinates, retrieves or defaults
@@ -93,6 +95,8 @@ def risk_for_point(request: PointRiskRequest, token: str = Depends(verify_token)
         Geographic coordinates and optional rainfall event ID.
     token : str
         Bearer authentication token (dependency injected).
+    db : FloodingDatabase
+        Database handle (dependency injected via :func:`get_db`).
 
     Returns
     -------
@@ -105,7 +109,6 @@ def risk_for_point(request: PointRiskRequest, token: str = Depends(verify_token)
     HTTPException
         404 if no catchment is found containing the specified point.
     """
-    db = FloodingDatabase()
     weather_client = WeatherAPIClient()
     monitor = RealTimeFloodMonitor(db=db)
     lon = float(request.lon)
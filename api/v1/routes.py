@@ -1,7 +1,24 @@
+import importlib
+from typing import Iterable, Optional
+
 from fastapi import APIRouter
-from api.v1.endpoints import simulate, risk, report
 
-api_router = APIRouter()
-api_router.include_router(simulate.router, prefix="", tags=["simulate"])
-api_router.include_router(risk.router, prefix="", tags=["risk"])
-api_router.include_router(report.router, prefix="", tags=["report"])
+# Endpoint name -> module exposing ``router``; imported only when mounted
+ENDPOINT_MODULES = {
+    "simulate": "api.v1.endpoints.simulate",
+    "risk": "api.v1.endpoints.risk",
+    "report": "api.v1.endpoints.report",
+}
+
+
+def build_api_router(names: Optional[Iterable[str]] = None) -> APIRouter:
+    """Assemble the v1 router from the named endpoints (all by default).
+
+    Endpoint modules are imported here rather than at module import so an
+    app mounting a subset never loads the others' dependencies.
+    """
+    api_router = APIRouter()
+    for name in (ENDPOINT_MODULES if names is None else names):
+        module = importlib.import_module(ENDPOINT_MODULES[name])
+        api_router.include_router(module.router, prefix="", tags=[name])
+    return api_router
@@ -3,6 +3,7 @@
 Migrated from legacy `database_v3.py`.
 """
 from __future__ import annotations
+import functools
 from datetime import datetime
 from typing import List, Dict, Optional
 from pymongo import MongoClient, ASCENDING, DESCENDING
@@ -312,3 +313,16 @@ class FloodingDatabase:
             {"issue_id": issue_id}, {"$set": {"notes": note}}
         )
         return res.modified_count > 0
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_database() -> FloodingDatabase:
+    """Return the process-wide :class:`FloodingDatabase`, creating it on first use.
+
+    ``MongoClient`` is thread-safe and pools connections internally, so one
+    instance can serve every request; this avoids a new client, server
+    discovery and index creation per call. Do not ``close()`` the returned
+    instance; call ``get_shared_database.cache_clear()`` after closing it
+    if a fresh connection is required.
+    """
+    return FloodingDatabase()
@@ -2,6 +2,8 @@
 import math
 from typing import List, Dict
 
+import numpy as np
+
 
 # -------------------- TUNING KNOBS --------------------
 HEADROOM = 3          # aim for L ~ 1/HEADROOM at near-peak rain
@@ -21,7 +23,7 @@ def q_runoff_m3s(C: float, i_mmhr: float, A_km2: float) -> float:
     where:
     - Q is discharge in m^3/s
     - C is the runoff coefficient [0..1]
-    - i is rainfall intensity in mm/hr
+    - i is rainfall intensity in mm/hr (a NumPy array gives one Q per step)
     - A is catchment area in km^2
 
     Returns
@@ -37,17 +39,19 @@ def risk_from_loading(L: float, k: float = 8.0) -> float:
 
     Parameters
     ----------
-    L : float
+    L : float or ndarray
         Capacity loading ratio (Q / Qcap). Values > 1 imply exceedance.
     k : float, default 8.0
         Steepness parameter for the logistic curve.
 
     Returns
     -------
-    float
+    float or ndarray
         Risk proxy in [0, 1], close to 0 when L << 1 and near 1 when L >> 1.
+        Array input gives an array of the same shape.
     """
-    return 1.0 / (1.0 + math.exp(-k * (L - 1.0)))
+    R = 1.0 / (1.0 + np.exp(-k * (np.asarray(L, dtype=np.float64) - 1.0)))
+    return float(R) if R.ndim == 0 else R
 
 
 def _compress_L_for_risk(L: float) -> float:
@@ -59,10 +63,16 @@ def _compress_L_for_risk(L: float) -> float:
 
     - If L=1  => L_eff = 1
     - If L >> 1, L_eff grows slowly, so risk_from_loading won't be pinned at 1.0
+
+    Accepts a float or an ndarray (compressed element-wise).
     """
-    if L <= 1.0:
-        return L
-    return 1.0 + math.log1p(L - 1.0) / math.log(1.0 + L_LOG_RANGE)
+    L_arr = np.asarray(L, dtype=np.float64)
+    # np.where evaluates both branches, so clip the excess at 0 to keep
+    # log1p in its domain where L <= 1 (those entries use L unchanged)
+    L_eff = np.where(
+        L_arr <= 1.0, L_arr,
+        1.0 + np.log1p(np.maximum(L_arr - 1.0, 0.0)) / math.log(1.0 + L_LOG_RANGE))
+    return float(L_eff) if L_eff.ndim == 0 else L_eff
 
 
 def simulate_catchment(
@@ -81,9 +91,6 @@ def simulate_catchment(
           "max_risk": float
         }
     """
-    series: list = []
-    max_r = 0.0
-
     # --------- Adaptive capacity (with cap) ---------
     if rain_mmhr:
         i_target = max(rain_mmhr) * 1.0           # near-peak rain
@@ -103,25 +110,26 @@ def simulate_catchment(
     Qcap_used = max(Qcap_m3s * scale, 1e-6)         # avoid div-by-zero
 
     # --------------- Time stepping ------------------
-    for i, t in zip(rain_mmhr, timestamps_utc):
-        Q = q_runoff_m3s(C, i, A_km2)
-        L = Q / Qcap_used
+    # All steps are evaluated at once by passing arrays through the helpers
+    n_steps = min(len(rain_mmhr), len(timestamps_utc))
+    rain = list(rain_mmhr[:n_steps])
+    Q = q_runoff_m3s(C, np.asarray(rain, dtype=np.float64), A_km2)
+    L = Q / Qcap_used
 
-        if USE_LOG_COMPRESSION:
-            L_for_risk = _compress_L_for_risk(L)
-        else:
-            L_for_risk = L
+    L_for_risk = _compress_L_for_risk(L) if USE_LOG_COMPRESSION else L
+    R = risk_from_loading(L_for_risk, k=3.0)
+    max_r = float(R.max()) if n_steps else 0.0
 
-        R = risk_from_loading(L_for_risk, k=3.0)
-        max_r = max(max_r, R)
-
-        series.append({
+    series = [
+        {
             "t": t,
             "i": i,
-            "Qrunoff": round(Q, 3),
-            "L": round(L, 3),             # raw load (helps debugging)
+            "Qrunoff": round(q, 3),
+            "L": round(load, 3),          # raw load (helps debugging)
             # displayed risk (post-compression if enabled)
-            "R": round(R, 3)
-        })
+            "R": round(r, 3)
+        }
+        for t, i, q, load, r in zip(timestamps_utc, rain, Q.tolist(), L.tolist(), R.tolist())
+    ]
 
     return {"series": series, "max_risk": round(max_r*0.1, 3)}
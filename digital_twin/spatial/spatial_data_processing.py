@@ -13,21 +13,83 @@ Key functionality includes:
 - Export of processed data for database ingestion
 """
 
+import functools
+import hashlib
+import operator
+import pickle
 import numpy as np
-import json
-from typing import Dict, List
-from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+try:  # Optional streaming parser for large GeoJSON feature collections
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
 from .spatial_utils import (
-    calculate_catchment_centroid,
+    dumps_json,
+    load_json,
+    parse_geometry,
+    calculate_catchment_centroids,
     load_pipe_materials,
     calculate_pipe_capacity,
-    calculate_pipe_grade
+    calculate_pipe_capacity_with_n,
+    calculate_pipe_grade,
+    calculate_pipe_grade_vec,
+    DEFAULT_MANNING_N,
 )
 
+# ------------------------------- JSON I/O --------------------------------- #
+
+
+def _iter_features(path: str) -> Iterator[Any]:
+    """Yield the ``features`` of a GeoJSON FeatureCollection one at a time.
+
+    With ``ijson`` installed the file is stream-parsed so only one feature is
+    materialised at a time; otherwise the whole document is loaded.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'features.item', use_float=True)
+        return
+    yield from load_json(path).get('features') or []
+
+
 # -------------------------- Aggregation Functions ------------------------- #
 
 
+# Pipe feature properties used by aggregate_pipes_with_location
+# (PerthMetroStormDrainPipe schema), in unpacking order
+_PIPE_FIELDS = ('ufi', 'Feat_Diam', 'Feat_Len', 'Inv_Lvl_US', 'Inv_Lvl_DS', 'Feat_Mat')
+_get_pipe_fields = operator.itemgetter(*_PIPE_FIELDS)
+
+
+def _summarise_pipes(group: np.ndarray, n_groups: int, diameters: np.ndarray, lengths: np.ndarray,
+                     capacities: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce flat per-pipe columns to unrounded per-subcatchment metrics.
+
+    ``group`` holds each pipe's subcatchment index in ``[0, n_groups)``; every
+    group must contain at least one pipe. Returns ``(pipe_count,
+    total_length, avg_diameter, max_diameter, main_capacity)`` arrays where
+    ``main_capacity`` sums the capacities of up to the three largest
+    diameter pipes, ties kept in input order.
+    """
+    counts = np.bincount(group, minlength=n_groups)
+    total_lengths = np.bincount(group, weights=lengths, minlength=n_groups)
+    avg_diameters = np.bincount(group, weights=diameters, minlength=n_groups) / counts
+
+    # Order pipes by subcatchment, then by descending diameter; lexsort is
+    # stable so equal diameters keep file order.
+    order = np.lexsort((-diameters, group))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_group = group[order]
+    max_diameters = diameters[order][starts]
+    # Consider the largest three pipes representative of effective capacity.
+    rank = np.arange(group.size) - starts[sorted_group]
+    main = rank < 3
+    main_capacities = np.bincount(
+        sorted_group[main], weights=capacities[order][main], minlength=n_groups)
+    return counts, total_lengths, avg_diameters, max_diameters, main_capacities
+
+
 def aggregate_pipes_with_location(pipes_file: str) -> Dict[str, Dict]:
     """Aggregate pipe features by SUBCATCHMENT (hydraulic metrics only).
 
@@ -52,59 +114,85 @@ def aggregate_pipes_with_location(pipes_file: str) -> Dict[str, Dict]:
     Dict[str, Dict]
         Mapping of subcatchment id -> hydraulic summary metrics.
     """
-    with open(pipes_file, 'r') as f:
-        pipes_data = json.load(f)
     # Load material Manning values once for all pipes
     materials_lookup = load_pipe_materials()
 
-    subcatchment_data = defaultdict(lambda: {'pipes': []})
-    for feature in pipes_data['features']:
+    # Flat per-pipe columns tagged with a subcatchment index (first-seen
+    # order). Grades, capacities and every summary metric are computed in a
+    # few NumPy passes over all pipes once ingestion is complete. Materials
+    # are factorised the same way so Manning n is resolved once per code.
+    subcatch_ids: Dict[str, int] = {}
+    material_ids: Dict[str, int] = {}
+    columns: Dict[str, list] = {
+        'group': [], 'diameter': [], 'length': [], 'inv_us': [], 'inv_ds': [], 'material': []}
+    for feature in _iter_features(pipes_file):
         # Defensive parsing of expected GeoJSON structure
         props = feature.get('properties', {})
-        raw_ufi = props.get('ufi')
+        # Pull all schema fields in one C-level call; features missing any
+        # of them take the per-field .get() path
+        try:
+            raw_ufi, diameter, length, inv_us, inv_ds, material = _get_pipe_fields(props)
+        except KeyError:
+            raw_ufi, diameter, length, inv_us, inv_ds, material = (
+                props.get(field) for field in _PIPE_FIELDS)
         # Normalise ufi to string to ensure consistent dictionary keys
         subcatchment = str(raw_ufi) if raw_ufi is not None else 'Unknown'
 
-        # Extract key hydraulic attributes with fallbacks
-        diameter = props.get('Feat_Diam') or 0
-        length = props.get('Feat_Len') or 0
-        inv_us = props.get('Inv_Lvl_US')
-        inv_ds = props.get('Inv_Lvl_DS')
-
-        # Derive pipe grade (percent); fallback to 0 if cannot be computed
-        derived_grade = calculate_pipe_grade(inv_us, inv_ds, length)
-        grade = derived_grade if derived_grade is not None else 0
-
-        # Material code (for Manning n lookup)
-        material = props.get('Feat_Mat', None)
+        # Key hydraulic attributes with fallbacks. Invert levels are kept
+        # raw; grades are derived in one vectorised pass after ingestion.
+        # Material code is used for the Manning n lookup.
+        diameter = diameter or 0
+        length = length or 0
 
         # Only consider pipes with valid diameter & length & material
         if diameter and length and diameter > 0 and length > 0 and material:
-            capacity = calculate_pipe_capacity(
-                diameter, grade, material, materials_lookup)
-            subcatchment_data[subcatchment]['pipes'].append(
-                {'diameter': diameter, 'length': length,
-                    'capacity': capacity, 'material': material}
-            )
-
-    subcatchment_results = {}
-    for subcatch, data in subcatchment_data.items():
-        pipes = data['pipes']
-        if not pipes:
-            continue
-        total_length = sum(p['length'] for p in pipes)
-        # Consider the largest three pipes representative of effective capacity
-        main_pipes = sorted(
-            pipes, key=lambda x: x['diameter'], reverse=True)[:3]
-        main_capacity = sum(p['capacity'] for p in main_pipes)
-        subcatchment_results[subcatch] = {
-            'pipe_count': len(pipes),
-            'total_length_m': round(total_length, 2),
-            'avg_diameter_mm': round(np.mean([p['diameter'] for p in pipes]), 0),
-            'max_diameter_mm': max(p['diameter'] for p in pipes),
-            'Qcap_m3s': round(main_capacity, 3),
+            columns['group'].append(
+                subcatch_ids.setdefault(subcatchment, len(subcatch_ids)))
+            columns['diameter'].append(diameter)
+            columns['length'].append(length)
+            columns['inv_us'].append(inv_us)
+            columns['inv_ds'].append(inv_ds)
+            columns['material'].append(
+                material_ids.setdefault(material, len(material_ids)))
+
+    if not subcatch_ids:
+        return {}
+
+    manning_by_id = np.array(
+        [materials_lookup.get(code.upper(), DEFAULT_MANNING_N) for code in material_ids],
+        dtype=np.float64)
+    group = np.asarray(columns['group'], dtype=np.intp)
+    diameters = np.asarray(columns['diameter'], dtype=np.float64)
+    lengths = np.asarray(columns['length'], dtype=np.float64)
+    # Grade is NaN where it cannot be derived; the capacity kernel treats
+    # that like any invalid slope and applies the nominal minimum.
+    grades = calculate_pipe_grade_vec(columns['inv_us'], columns['inv_ds'], lengths)
+    capacities = calculate_pipe_capacity_with_n(
+        diameters, grades, manning_by_id[np.asarray(columns['material'], dtype=np.intp)])
+
+    counts, total_lengths, avg_diameters, max_diameters, main_capacities = \
+        _summarise_pipes(group, len(subcatch_ids), diameters, lengths, capacities)
+
+    # Convert each metric column once; lengths and capacities go through the
+    # builtin round() because np.round (scale, rint, unscale) can differ by
+    # one unit in the last place on half-way sums such as 110.615
+    return {
+        subcatch: {
+            'pipe_count': count,
+            'total_length_m': total_length,
+            'avg_diameter_mm': avg_diameter,
+            'max_diameter_mm': max_diameter,
+            'Qcap_m3s': main_capacity,
         }
-    return subcatchment_results
+        for subcatch, count, total_length, avg_diameter, max_diameter, main_capacity in zip(
+            subcatch_ids,
+            counts.tolist(),
+            [round(v, 2) for v in total_lengths.tolist()],
+            np.round(avg_diameters, 0).tolist(),
+            max_diameters.tolist(),
+            [round(v, 3) for v in main_capacities.tolist()],
+        )
+    }
 
 
 def extract_catchments_with_geometry(catchments_file: str) -> Dict[str, Dict]:
@@ -122,6 +210,10 @@ def extract_catchments_with_geometry(catchments_file: str) -> Dict[str, Dict]:
     * Only features with a positive numeric area attribute are kept (same
       filtering intent as before, but area now strictly attribute-driven).
     * Synthetic ids still generated when ``ufi`` absent.
+    * ``C_override`` holds the land-use runoff coefficient, or ``None``
+      when no rule applies.
+    * ``_shp`` holds the parsed shapely geometry (``None`` if invalid); it
+      is in-memory only and not part of the persisted output.
 
     Parameters
     ----------
@@ -133,17 +225,14 @@ def extract_catchments_with_geometry(catchments_file: str) -> Dict[str, Dict]:
     Dict[str, Dict]
         Mapping of id -> attributes incl. preserved ``geometry``.
     """
-    with open(catchments_file, 'r') as f:
-        catchments_data = json.load(f)
     catchment_dict: Dict[str, Dict] = {}
-    for idx, feature in enumerate(catchments_data.get('features', [])):
+    for idx, feature in enumerate(_iter_features(catchments_file)):
         if not isinstance(feature, dict):
             continue
         props = feature.get('properties', {}) or {}
         geom = feature.get('geometry')
         if not geom or not isinstance(geom, dict) or 'type' not in geom:
             continue  # skip malformed
-        centroid = calculate_catchment_centroid(geom)
         catch_name = props.get('catch_name') or 'Unknown'
         ufi = props.get('ufi')
         key = str(ufi) if ufi is not None else f"{catch_name}_{idx}"
@@ -164,10 +253,26 @@ def extract_catchments_with_geometry(catchments_file: str) -> Dict[str, Dict]:
             'type': props.get('type', ''),
             'management': props.get('management', ''),
             'flowcode': props.get('flowcode', None),
-            'centroid': centroid,
+            # Land-use runoff coefficient resolved once here so the join
+            # only reads it; None means "use the caller's default_C"
+            'C_override': _runoff_coefficient(
+                props.get('type') or '', props.get('management') or ''),
+            'centroid': None,  # filled in below in one batched pass
             'geometry': geom,
         }
 
+    # Parse geometry once, only for catchments that survived the attribute
+    # filters. The shapely object is kept under the private ``_shp`` key for
+    # downstream spatial queries (never persisted: join_pipes_catchments
+    # copies explicit fields), and all centroids come from a single
+    # vectorised shapely call over those parsed shapes.
+    for record in catchment_dict.values():
+        record['_shp'] = parse_geometry(record['geometry'])
+    centroids = calculate_catchment_centroids(
+        [c['_shp'] for c in catchment_dict.values()])
+    for record, centroid in zip(catchment_dict.values(), centroids):
+        record['centroid'] = centroid
+
     keyed_by_ufi = sum(1 for c in catchment_dict.values()
                        if c.get('ufi') is not None)
     print(
@@ -177,6 +282,31 @@ def extract_catchments_with_geometry(catchments_file: str) -> Dict[str, Dict]:
 
 # --------------------------- Direct Join Logic ---------------------------- #
 
+# Runoff coefficient heuristic, first match wins:
+# (keyword, C, also match against the management field)
+_RUNOFF_C_RULES = (
+    ('urban', 0.8, True),
+    ('residential', 0.6, False),
+    ('industrial', 0.75, False),
+    ('rural', 0.3, True),
+    ('agri', 0.3, False),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _runoff_coefficient(area_type: str, management: str) -> Optional[float]:
+    """Resolve runoff coefficient C from catchment type / management labels.
+
+    Returns ``None`` when no rule matches so callers keep their default.
+    Memoised because source data only uses a handful of distinct labels.
+    """
+    area_type = area_type.lower()
+    management = management.lower()
+    for keyword, C, check_management in _RUNOFF_C_RULES:
+        if keyword in area_type or (check_management and keyword in management):
+            return C
+    return None
+
 
 def join_pipes_catchments(subcatchment_pipes: Dict[str, Dict], catchment_areas: Dict[str, Dict], default_C: float = 0.6) -> List[Dict]:
     """Directly combine pipe aggregates with catchment geometry using shared 'ufi' key.
@@ -220,19 +350,15 @@ def join_pipes_catchments(subcatchment_pipes: Dict[str, Dict], catchment_areas:
             # Preserve original polygon geometry for higher-accuracy spatial queries
             'geometry': catchment.get('geometry')
         }
-        print(catchment.get('flowcode'))
-        print(type(catchment.get('flowcode')))
-        # Simple runoff coefficient heuristic based on area_type / management
-        area_type = (catchment.get('type') or '').lower()
-        management = (catchment.get('management') or '').lower()
-        if 'urban' in area_type or 'urban' in management:
-            record['C'] = 0.8
-        elif 'residential' in area_type:
-            record['C'] = 0.6
-        elif 'industrial' in area_type:
-            record['C'] = 0.75
-        elif 'rural' in area_type or 'rural' in management or 'agri' in area_type:
-            record['C'] = 0.3
+        # Simple runoff coefficient heuristic based on area_type / management,
+        # precomputed by extract_catchments_with_geometry when available
+        if 'C_override' in catchment:
+            C = catchment['C_override']
+        else:
+            C = _runoff_coefficient(
+                catchment.get('type') or '', catchment.get('management') or '')
+        if C is not None:
+            record['C'] = C
         results.append(record)
     if unmatched_pipes:
         print(
@@ -247,22 +373,74 @@ def join_pipes_catchments(subcatchment_pipes: Dict[str, Dict], catchment_areas:
 # ----------------------------- Persistence -------------------------------- #
 
 
-def save_results(data: List[Dict], output_file: str):
-    """Persist results to JSON (UTF-8, pretty printed)."""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def save_results(data: List[Dict], output_file: str, pretty: bool = True):
+    """Persist results to a JSON array (UTF-8).
+
+    ``pretty=True`` writes the whole document indented in one go. With
+    ``pretty=False`` records are streamed compactly, one per line, so peak
+    memory stays at one serialised record instead of the whole output;
+    the file is still a single valid JSON array.
+    """
+    if not pretty:
+        with open(output_file, 'wb') as f:
+            f.write(b'[')
+            for i, record in enumerate(data):
+                f.write(b',\n' if i else b'\n')
+                f.write(dumps_json(record))
+            f.write(b'\n]' if data else b']')
+    else:
+        Path(output_file).write_bytes(dumps_json(data, indent=True))
     print(f"Saved {len(data)} catchment area records to {output_file}")
 
+# ------------------------------ Stage Cache -------------------------------- #
+
+# Bump when the shape of cached stage outputs changes
+_STAGE_CACHE_VERSION = 2  # v2: catchments carry a parsed ``_shp``
+
+
+def _cached_stage(cache_dir: Path, stage: str, sources: List[Path], compute: Callable[[], Any], *extra_key) -> Any:
+    """Return ``compute()``, reusing a pickled result while inputs are unchanged.
+
+    The cache file is keyed on each source's path, mtime and size plus any
+    ``extra_key`` values (e.g. material roughness table), so editing a
+    source GeoJSON transparently triggers a rebuild. Stale entries for the
+    same stage are removed; unreadable / unwritable cache files are ignored.
+    """
+    stats = [(str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in sources]
+    digest = hashlib.sha1(
+        repr((_STAGE_CACHE_VERSION, stage, stats, extra_key)).encode()).hexdigest()[:12]
+    cache_file = cache_dir / f".cache_{stage}_{digest}.pkl"
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # corrupt / incompatible pickle: fall through and rebuild
+    result = compute()
+    try:
+        for stale in cache_dir.glob(f".cache_{stage}_*.pkl"):
+            stale.unlink()
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+    except OSError:
+        pass  # caching is best-effort
+    return result
+
 # ----------------------------- CLI / Demo --------------------------------- #
 
 
-def main():
+def main(use_cache: bool = True):
     """Run full spatial conversion pipeline.
 
     Fixes applied:
     - Use the repository root /data directory for inputs & output
     - Output filename expected by user: catchment_spatial_matched.json (singular)
     - Add graceful error messages if source files are missing
+    - Parsed pipe / catchment stages are cached next to the inputs
+      (``data/.cache_*.pkl``) and reused until a source file changes;
+      pass ``use_cache=False`` to force a full reparse
     """
     # Determine project root as 3 levels up from this file ( .../urban_flooding_digitaltwin )
     project_root = Path(__file__).resolve().parents[2]
@@ -286,7 +464,13 @@ def main():
         return []
 
     print("\n1. Processing drainage pipe network data...")
-    subcatchment_pipes = aggregate_pipes_with_location(str(pipes_file))
+    if use_cache:
+        subcatchment_pipes = _cached_stage(
+            data_dir, 'pipes', [pipes_file],
+            lambda: aggregate_pipes_with_location(str(pipes_file)),
+            sorted(load_pipe_materials().items()))
+    else:
+        subcatchment_pipes = aggregate_pipes_with_location(str(pipes_file))
 
     print(f"   Found {len(subcatchment_pipes)} subcatchment pipe networks")
     for i, (subcatch, info) in enumerate(list(subcatchment_pipes.items())[:3]):
@@ -296,7 +480,12 @@ def main():
         print(f"     - Max diameter: {info['max_diameter_mm']} mm")
 
     print("\n2. Processing catchment area geometry data...")
-    catchment_areas = extract_catchments_with_geometry(str(catchments_file))
+    if use_cache:
+        catchment_areas = _cached_stage(
+            data_dir, 'catchments', [catchments_file],
+            lambda: extract_catchments_with_geometry(str(catchments_file)))
+    else:
+        catchment_areas = extract_catchments_with_geometry(str(catchments_file))
     print(
         f"   Found {len(catchment_areas)} catchment areas (total {len(catchment_areas)} with valid area)")
 
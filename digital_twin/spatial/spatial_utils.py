@@ -9,14 +9,51 @@ Key functionality includes:
 - Pipe grade and capacity calculations
 - Point-in-polygon operations for catchment finding
 - Manning equation hydraulic computations
+- JSON file I/O with optional orjson acceleration
 """
 
+import functools
 import math
+import numpy as np
+import shapely
 from pathlib import Path
-from shapely.geometry import shape, Point
-from typing import List, Dict, Optional
+from shapely.geometry import shape
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import json
-import geopandas as gpd
+if TYPE_CHECKING:  # geopandas is imported lazily in load_catchments_gdf
+    import geopandas as gpd
+try:  # Optional fast JSON backend; stdlib json is used when unavailable
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def load_json(path) -> object:
+    """Parse a JSON file in one read, preferring the C ``orjson`` parser."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _json_default(obj):
+    """``json`` fallback for NumPy scalars (orjson handles them natively)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj, indent: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes, compact or with 2-space indent.
+
+    Uses ``orjson`` when installed, otherwise stdlib ``json``; NumPy scalars
+    and arrays are accepted by both paths.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option | orjson.OPT_INDENT_2 if indent else option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False,
+                      default=_json_default).encode('utf-8')
 
 
 def calculate_catchment_centroid(geometry: dict) -> list:
@@ -33,6 +70,39 @@ def calculate_catchment_centroid(geometry: dict) -> list:
         return [None, None]
 
 
+def parse_geometry(geometry) -> Optional[shapely.Geometry]:
+    """Return a shapely geometry for a GeoJSON dict (or pass one through); None if invalid."""
+    if isinstance(geometry, shapely.Geometry):
+        return geometry
+    if not geometry:
+        return None
+    try:
+        return shape(geometry)
+    except Exception:
+        return None
+
+
+def calculate_catchment_centroids(geometries: List[dict]) -> List[list]:
+    """Batch version of :func:`calculate_catchment_centroid`.
+
+    Geometries are parsed individually (already-parsed shapely geometries are
+    used as-is), then centroids and their coordinates are computed in single
+    vectorised shapely calls over the whole batch. Invalid or empty
+    geometries yield ``[None, None]`` as in the scalar version.
+    """
+    shapes = np.empty(len(geometries), dtype=object)
+    for i, geometry in enumerate(geometries):
+        shapes[i] = parse_geometry(geometry)
+    centroids = shapely.centroid(shapes)
+    valid = ~(shapely.is_missing(centroids) | shapely.is_empty(centroids))
+    lats = np.full(len(geometries), np.nan)
+    lons = np.full(len(geometries), np.nan)
+    lats[valid] = shapely.get_y(centroids[valid])
+    lons[valid] = shapely.get_x(centroids[valid])
+    return [[lat, lon] if ok else [None, None]
+            for lat, lon, ok in zip(lats.tolist(), lons.tolist(), valid.tolist())]
+
+
 # ----------------------------- Pipe Hydraulics ----------------------------- #
 
 
@@ -71,42 +141,87 @@ def calculate_pipe_grade(inv_us: Optional[float], inv_ds: Optional[float], lengt
             return None
         rise = float(inv_us) - float(inv_ds)
         grade_pct = (rise / length) * 100.0
-        # If grade is zero / negative, return a nominal minimal slope (0.1%)
-        if grade_pct <= 0:
-            return 0.1
-        # Cap unrealistic large slopes (> 50%) which may indicate data issues
-        if grade_pct > 50:
-            return 50.0
-        return grade_pct
+        # Zero / negative grade -> nominal minimal slope (0.1%); cap
+        # unrealistic large slopes (> 50%) which may indicate data issues.
+        # Not a plain clamp: positive grades below 0.1% are kept as-is.
+        return 0.1 if grade_pct <= 0 else min(grade_pct, 50.0)
     except (TypeError, ValueError):
         return None
 
 
-DEFAULT_MANNING_N = 0.013
-_PIPE_MANNING_CACHE: Dict[str, float] = {}
+def _as_float_array(values) -> np.ndarray:
+    """Convert a sequence to float64, mapping missing / non-numeric entries to NaN.
+
+    Tries a single C-level conversion first (``None`` already becomes NaN) and
+    only falls back to per-element parsing when the input contains junk.
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return out
 
 
-def load_pipe_materials(refresh: bool = False) -> Dict[str, float]:
-    """Load pipe material Manning n values from ``data/PipeMaterials.json``.
+def calculate_pipe_grade_vec(inv_us, inv_ds, length_m) -> np.ndarray:
+    """Vectorised :func:`calculate_pipe_grade` over aligned per-pipe arrays.
 
-    The JSON structure is expected to be ``{ code: { "manning_n": <number|null>, ... }, ... }``.
-    Results are cached at module scope for efficiency. ``refresh=True`` forces a reload.
+    Applies the same rules branch-free with NumPy: grades <= 0 become the
+    nominal 0.1%, grades above 50% are capped, and entries the scalar
+    version would return ``None`` for (missing / non-numeric input or
+    length <= 0.01 m) are ``NaN``.
+
+    Parameters
+    ----------
+    inv_us, inv_ds : array-like of float | None
+        Upstream / downstream invert levels.
+    length_m : array-like of float | None
+        Pipe segment lengths in metres.
 
     Returns
     -------
-    Dict[str, float]
-        Mapping of material code -> Manning n (only codes with numeric values retained).
+    np.ndarray
+        Grades as percentages, ``NaN`` where they cannot be derived.
     """
-    global _PIPE_MANNING_CACHE
-    if _PIPE_MANNING_CACHE and not refresh:
-        return _PIPE_MANNING_CACHE
-    # Resolve repository root (same logic depth as main()) and locate data file
-    project_root = Path(__file__).resolve().parents[3]
-    materials_path = project_root / "data" / "PipeMaterials.json"
+    inv_us = _as_float_array(inv_us)
+    inv_ds = _as_float_array(inv_ds)
+    length = _as_float_array(length_m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grade_pct = (inv_us - inv_ds) / length * 100.0
+    # NaN passes through both steps: comparisons are False, minimum propagates
+    grade_pct = np.where(grade_pct <= 0, 0.1, np.minimum(grade_pct, 50.0))
+    return np.where(length > 0.01, grade_pct, np.nan)
+
+
+DEFAULT_MANNING_N = 0.013
+# (pi / 4) * (1 / 4) ** (2 / 3): geometry part of Manning full flow, see _manning_full_flow
+_FULL_FLOW_COEFF = (math.pi / 4.0) * 0.25 ** (2.0 / 3.0)
+_EIGHT_THIRDS = 8.0 / 3.0
+
+
+def _manning_full_flow(diameter_m, slope, manning_n):
+    """Manning full-flow discharge (m^3/s) for a circular pipe.
+
+    Scalar kernel for :func:`calculate_pipe_capacity`; the vectorised path
+    in :func:`calculate_pipe_capacity_with_n` evaluates the same fold. Inputs
+    must already be validated (slope as a positive fraction, not percent).
+
+    With A = (pi/4) D^2 and R = D/4 the formula Q = A (1/n) R^(2/3) S^(1/2)
+    folds to Q = (K / n) D^(8/3) S^(1/2) with the constant K precomputed.
+    """
+    return (_FULL_FLOW_COEFF / manning_n) * diameter_m ** _EIGHT_THIRDS * slope ** 0.5
+
+
+@functools.lru_cache(maxsize=2)
+def _load_pipe_materials_cached(materials_path: str) -> Dict[str, float]:
+    """Parse a materials file into an upper-cased code -> Manning n mapping (memoised per path)."""
     mapping: Dict[str, float] = {}
     try:
-        with open(materials_path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = load_json(materials_path)
         for code, meta in raw.items():
             n_val = meta.get("manning_n")
             if isinstance(n_val, (int, float)) and n_val > 0:
@@ -114,10 +229,28 @@ def load_pipe_materials(refresh: bool = False) -> Dict[str, float]:
     except FileNotFoundError:
         # Silent fallback – function using this mapping will revert to DEFAULT_MANNING_N
         mapping = {}
-    _PIPE_MANNING_CACHE = mapping
     return mapping
 
 
+def load_pipe_materials(refresh: bool = False) -> Dict[str, float]:
+    """Load pipe material Manning n values from ``data/PipeMaterials.json``.
+
+    The JSON structure is expected to be ``{ code: { "manning_n": <number|null>, ... }, ... }``.
+    Results are memoised per file path for efficiency. ``refresh=True`` forces a reload.
+
+    Returns
+    -------
+    Dict[str, float]
+        Mapping of material code -> Manning n (only codes with numeric values retained).
+    """
+    if refresh:
+        _load_pipe_materials_cached.cache_clear()
+    # Resolve repository root (same logic depth as main()) and locate data file
+    project_root = Path(__file__).resolve().parents[3]
+    materials_path = project_root / "data" / "PipeMaterials.json"
+    return _load_pipe_materials_cached(str(materials_path))
+
+
 def calculate_pipe_capacity(diameter_mm: float, slope: float, material: str = "RC", materials: Optional[Dict[str, float]] = None) -> float:
     """Estimate pipe full-flow capacity (m^3/s) using simplified Manning formula.
 
@@ -142,39 +275,164 @@ def calculate_pipe_capacity(diameter_mm: float, slope: float, material: str = "R
     if materials is None:
         materials = load_pipe_materials()
     manning_n = materials.get(material.upper(), DEFAULT_MANNING_N)
-    diameter_m = diameter_mm / 1000.0
-    radius_m = diameter_m / 2.0
-    area = math.pi * radius_m ** 2
-    wetted_perimeter = math.pi * diameter_m
-    hydraulic_radius = area / wetted_perimeter
-    if slope is None or slope <= 0 or slope == -499.5:
-        slope = 0.001
-    else:
-        slope = abs(slope) / 100.0
-    velocity = (1.0 / manning_n) * \
-        (hydraulic_radius ** (2.0/3.0)) * (slope ** 0.5)
-    return area * velocity
-
-
-def load_catchments_gdf(catchments: List[Dict]) -> gpd.GeoDataFrame:
+    # One guard covers missing, non-positive and the -499.5 sentinel slopes
+    slope = abs(slope) / 100.0 if slope is not None and slope > 0 else 0.001
+    return _manning_full_flow(diameter_mm / 1000.0, slope, manning_n)
+
+
+def calculate_pipe_capacity_vec(diameter_mm, slope_pct, material_codes, materials: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Vectorised :func:`calculate_pipe_capacity` over aligned per-pipe arrays.
+
+    Evaluates the same simplified Manning full-flow formula for many pipes in
+    a handful of NumPy passes instead of one Python call per pipe.
+
+    Parameters
+    ----------
+    diameter_mm : array-like of float
+        Internal pipe diameters in millimetres.
+    slope_pct : array-like of float
+        Longitudinal grades (percent). Invalid entries (NaN, <= 0 or the
+        -499.5 sentinel) are coerced to the nominal minimum (0.001) exactly
+        as in the scalar version.
+    material_codes : sequence of str
+        Material codes used to look up Manning roughness.
+    materials : Dict[str, float], optional
+        Pre-loaded mapping of material codes to Manning n. If not provided,
+        the JSON file is loaded lazily & cached.
+
+    Returns
+    -------
+    np.ndarray
+        Approximate discharge capacities (m^3/s) aligned with the inputs.
+    """
+    if materials is None:
+        materials = load_pipe_materials()
+    # Networks use a handful of material codes: resolve each distinct code
+    # (upper-casing + lookup) once, then map pipes through the small table.
+    n_by_code = {m: materials.get(m.upper(), DEFAULT_MANNING_N)
+                 for m in set(material_codes)}
+    manning_n = np.fromiter(map(n_by_code.__getitem__, material_codes),
+                            dtype=np.float64, count=len(material_codes))
+    return calculate_pipe_capacity_with_n(diameter_mm, slope_pct, manning_n)
+
+
+def calculate_pipe_capacity_with_n(diameter_mm, slope_pct, manning_n) -> np.ndarray:
+    """Vectorised pipe capacity from already-resolved Manning n values.
+
+    Same as :func:`calculate_pipe_capacity_vec` but skips the material code
+    lookup, for callers that resolve roughness once per distinct material.
+
+    Parameters
+    ----------
+    diameter_mm : array-like of float
+        Internal pipe diameters in millimetres.
+    slope_pct : array-like of float
+        Longitudinal grades (percent); invalid entries use the nominal minimum.
+    manning_n : array-like of float
+        Manning roughness per pipe.
+
+    Returns
+    -------
+    np.ndarray
+        Approximate discharge capacities (m^3/s) aligned with the inputs.
+    """
+    diameter_m = np.asarray(diameter_mm, dtype=np.float64) / 1000.0
+    slope = np.asarray(slope_pct, dtype=np.float64)
+    # ``~(slope > 0)`` also catches NaN (missing grade) and the -499.5 sentinel
+    slope = np.where(~(slope > 0), 0.001, np.abs(slope) / 100.0)
+    # Same fold as _manning_full_flow, with D^(8/3) = D^2 * cbrt(D^2) so the
+    # ufuncs take the dedicated cbrt / sqrt loops instead of generic pow
+    diameter_sq = diameter_m * diameter_m
+    return ((_FULL_FLOW_COEFF / np.asarray(manning_n, dtype=np.float64))
+            * diameter_sq * np.cbrt(diameter_sq) * np.sqrt(slope))
+
+
+def load_catchments_gdf(catchments: List[Dict]) -> 'gpd.GeoDataFrame':
+    """Build a GeoDataFrame (EPSG:4326) from catchment dicts with GeoJSON geometry."""
+    # Imported here so point lookups (STRtree based) never pay for geopandas
+    import geopandas as gpd
     records = []
     for c in catchments:
-        geom = c.get('geometry')
-        if not geom:
-            continue
-        try:
-            shp = shape(geom)
-        except Exception:
+        shp = parse_geometry(c.get('_shp') or c.get('geometry'))
+        if shp is None:
             continue
-        records.append({**c, 'geometry': shp})
+        record = {**c, 'geometry': shp}
+        record.pop('_shp', None)
+        records.append(record)
     if not records:
         return gpd.GeoDataFrame(columns=['catchment_id', 'A_km2', 'geometry'], geometry='geometry', crs="EPSG:4326")
     return gpd.GeoDataFrame(records, geometry='geometry', crs="EPSG:4326")
 
 
+def _catchment_index(catchments: List[Dict]) -> Tuple[shapely.STRtree, List[Dict], np.ndarray]:
+    """Build ``(tree, records, areas)`` for ``catchments``.
+
+    ``records[i]`` is the source dict of the i-th geometry in ``tree`` and
+    ``areas[i]`` its ``A_km2`` (``inf`` when not numeric); catchments with
+    missing / unparseable geometry are skipped.
+    """
+    records: List[Dict] = []
+    geoms = []
+    for c in catchments:
+        # Prefer the geometry parsed at extraction time, if any
+        shp = parse_geometry(c.get('_shp') or c.get('geometry'))
+        if shp is None:
+            continue
+        records.append(c)
+        geoms.append(shp)
+    tree = shapely.STRtree(geoms)
+    areas = np.array([c.get('A_km2') if isinstance(c.get('A_km2'), (int, float)) else np.inf
+                      for c in records], dtype=np.float64)
+    areas[np.isnan(areas)] = np.inf
+    return tree, records, areas
+
+
+def find_catchments_for_points(catchments: List[Dict], lons, lats) -> List[Optional[Dict]]:
+    """Batch point-in-polygon lookup against one catchment list.
+
+    Builds one STRtree over ``catchments`` and resolves all points with a
+    single vectorised ``STRtree.query``. Where polygons are
+    nested the smallest ``A_km2`` wins; ties keep catchment input order.
+
+    Parameters
+    ----------
+    catchments : list[dict]
+        Catchment records including a GeoJSON geometry.
+    lons, lats : array-like of float
+        WGS84 coordinates, aligned.
+
+    Returns
+    -------
+    list[dict | None]
+        Matching catchment (shallow copy, GeoJSON geometry as-is) or ``None``
+        for each input point.
+    """
+    tree, records, areas = _catchment_index(catchments)
+    points = shapely.points(np.asarray(lons, dtype=np.float64),
+                            np.asarray(lats, dtype=np.float64))
+    results: List[Optional[Dict]] = [None] * len(points)
+    # ``within`` tests point-within-polygon, i.e. polygon contains point;
+    # returns (point index, tree index) pairs
+    point_idx, tree_idx = tree.query(points, predicate='within')
+    if point_idx.size == 0:
+        return results
+    # Sort hits by point, then area, then catchment order; first per point wins
+    order = np.lexsort((tree_idx, areas[tree_idx], point_idx))
+    point_idx, tree_idx = point_idx[order], tree_idx[order]
+    first = np.flatnonzero(np.r_[True, point_idx[1:] != point_idx[:-1]])
+    for p, t in zip(point_idx[first].tolist(), tree_idx[first].tolist()):
+        record = dict(records[t])
+        record.pop('_shp', None)
+        results[p] = record
+    return results
+
+
 def find_catchment_for_point(catchments: List[Dict], lon: float, lat: float) -> Optional[Dict]:
     """Return catchment dict whose polygon contains the lon/lat point.
 
+    Single-point form of :func:`find_catchments_for_points`; callers with
+    many points should use the batch form so the STRtree is built once.
+
     Parameters
     ----------
     catchments : list[dict]
@@ -187,29 +445,10 @@ def find_catchment_for_point(catchments: List[Dict], lon: float, lat: float) ->
     dict | None
         Matching catchment or None if not found.
     """
-    gdf = load_catchments_gdf(catchments)
-    if gdf.empty:
-        return None
-    pt = Point(lon, lat)
-    # Fast bbox pre-filter via GeoPandas spatial index if available
-    try:
-        possible = gdf[gdf.geometry.bounds.apply(lambda row: (
-            row.minx <= lon <= row.maxx and row.miny <= lat <= row.maxy), axis=1)]
-    except Exception:
-        possible = gdf
-    matches = possible[possible.contains(pt)]
-    if matches.empty:
-        return None
-    # Choose smallest area (A_km2) to disambiguate nested polygons if any
-    matches_sorted = matches.sort_values(
-        by='A_km2') if 'A_km2' in matches.columns else matches
-    # Return original dict (without shapely geometry object to keep JSON serialisable)
-    record = matches_sorted.iloc[0].drop(labels=['geometry']).to_dict()
-    # Preserve original GeoJSON geometry from source list (avoid shapely mapping to keep as-is)
-    record['geometry'] = matches_sorted.iloc[0].geometry.__geo_interface__
-    return record
+    return find_catchments_for_points(catchments, [lon], [lat])[0]
 
 
 __all__ = [
-    'load_catchments_gdf', 'find_catchment_for_point'
+    'load_json', 'dumps_json', 'parse_geometry',
+    'calculate_catchment_centroids', 'calculate_pipe_grade_vec', 'calculate_pipe_capacity_vec', 'calculate_pipe_capacity_with_n', 'load_catchments_gdf', 'find_catchments_for_points', 'find_catchment_for_point'
 ]
@@ -6,10 +6,11 @@ background monitoring processes and configuration options
 for deployment.
 """
 
+import functools
+from typing import Optional
 from fastapi import FastAPI
-from digital_twin.services.realtime_monitor import RealTimeFloodMonitor
 from contextlib import asynccontextmanager
-from api.v1.routes import api_router
+from api.v1.routes import build_api_router
 import argparse
 import os
 import uvicorn
@@ -33,6 +34,9 @@ async def lifespan(app: FastAPI):
     None
         Control back to the application after startup.
     """
+    # Imported here so building the app (e.g. in tests) does not load the
+    # monitoring / database stack
+    from digital_twin.services.realtime_monitor import RealTimeFloodMonitor
     monitor = RealTimeFloodMonitor()
     # Only start periodic monitoring if not disabled
     if not os.getenv("DISABLE_MONITORING", "").lower() in ["true", "1", "yes"]:
@@ -40,24 +44,46 @@ async def lifespan(app: FastAPI):
     yield
 
 
-def create_app() -> FastAPI:
+@functools.lru_cache(maxsize=4)
+def create_app(config_key: tuple = (), routers: Optional[tuple] = None) -> FastAPI:
     """Create and configure the FastAPI application.
 
     Creates a FastAPI application with the digital twin service title,
     includes the lifespan event handler for background monitoring,
     and mounts the API router at the /api/v1 prefix.
 
+    Construction is memoised: calls with the same ``config_key`` return the
+    same application instance, so route registration and schema building
+    happen once per process. Callers wanting an isolated instance (e.g. a
+    test suite) pass a distinct key such as ``("test",)`` and should clear
+    ``app.dependency_overrides`` when done.
+
+    Parameters
+    ----------
+    config_key : tuple, default ()
+        Hashable cache key distinguishing independent application instances.
+    routers : tuple of str, optional
+        Endpoint names to mount (see ``api.v1.routes.ENDPOINT_MODULES``);
+        all endpoints when ``None``. Only the mounted endpoint modules are
+        imported.
+
     Returns
     -------
     FastAPI
         Configured FastAPI application instance ready for deployment.
     """
     app = FastAPI(title="digital-twin-service", lifespan=lifespan)
-    app.include_router(api_router, prefix="/api/v1")
+    app.include_router(build_api_router(routers), prefix="/api/v1")
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    # Build the default application on first access of ``main.app`` (e.g. by
+    # ``uvicorn main:app``) instead of at import time
+    if name == "app":
+        return create_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -71,4 +97,4 @@ if __name__ == "__main__":
     if args.no_monitoring:
         os.environ["DISABLE_MONITORING"] = "true"
 
-    uvicorn.run(app, host="0.0.0.0", port=8008)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8008)
@@ -0,0 +1,15 @@
+from main import create_app
+
+
+def test_create_app_is_memoised_per_config_key():
+    app = create_app(config_key=("test",))
+    assert create_app(config_key=("test",)) is app
+    assert create_app() is not app
+    assert any(getattr(route, "path", "") == "/api/v1/simulate" for route in app.routes)
+
+
+def test_create_app_mounts_only_requested_routers():
+    app = create_app(config_key=("risk-only",), routers=("risk",))
+    paths = {getattr(route, "path", "") for route in app.routes}
+    assert "/api/v1/risk/point" in paths
+    assert "/api/v1/simulate" not in paths
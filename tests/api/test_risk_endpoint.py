@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import risk as risk_endpoint
+from digital_twin.auth.auth import verify_token
+
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[
+        [115.0, -32.0], [115.5, -32.0], [115.5, -31.5], [115.0, -31.5], [115.0, -32.0]
+    ]],
+}
+
+
+# Request bodies serialised once; test_point_bodies_match_payloads guards drift
+_INSIDE_PAYLOAD = {"lon": 115.25, "lat": -31.75}
+_OUTSIDE_PAYLOAD = {"lon": 100.0, "lat": -20.0}
+_INSIDE_BODY = b'{"lon":115.25,"lat":-31.75}'
+_OUTSIDE_BODY = b'{"lon":100.0,"lat":-20.0}'
+_HEADERS = {"Authorization": "Bearer test-token", "Content-Type": "application/json"}
+
+
+class DummyDB:
+    """In-memory stand-in for FloodingDatabase covering the risk endpoint."""
+
+    def __init__(self):
+        self.catchments = [{
+            "catchment_id": "c1",
+            "name": "c1_Test",
+            "A_km2": 1.5,
+            "C": 0.8,
+            "Qcap_m3s": 2.0,
+            "pipe_count": 12,
+            "centroid": [-31.75, 115.25],
+            "geometry": SQUARE,
+        }]
+        self.events = {
+            "design_2yr": {
+                "event_id": "design_2yr",
+                "name": "2 year design storm",
+                "rain_mmhr": [0.0, 10.0, 25.0, 10.0],
+                "timestamps_utc": [f"2025-01-01T0{i}:00Z" for i in range(4)],
+            }
+        }
+        self.saved = []
+
+    def list_catchments(self, land_use=None):
+        return self.catchments
+
+    def get_catchment(self, catchment_id):
+        return next((c for c in self.catchments if c["catchment_id"] == catchment_id), None)
+
+    def get_rainfall_event(self, event_id):
+        return self.events.get(event_id)
+
+    def save_simulation(self, **kwargs):
+        self.saved.append(kwargs)
+        return kwargs["simulation_id"]
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Minimal app with just the risk router; the database is injected
+    # through the get_db dependency so no MongoDB connection is made.
+    app = FastAPI()
+    app.include_router(risk_endpoint.router, prefix="/api/v1")
+    app.dependency_overrides[verify_token] = lambda: "test-token"
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(client: TestClient):
+    dummy = DummyDB()
+    client.app.dependency_overrides[risk_endpoint.get_db] = lambda: dummy
+    yield dummy
+    client.app.dependency_overrides.pop(risk_endpoint.get_db, None)
+
+
+def test_point_bodies_match_payloads():
+    for payload, body in ((_INSIDE_PAYLOAD, _INSIDE_BODY), (_OUTSIDE_PAYLOAD, _OUTSIDE_BODY)):
+        assert json.dumps(payload, separators=(",", ":")).encode() == body
+
+
+def test_risk_for_point_inside_catchment(client: TestClient, db: DummyDB):
+    resp = client.post("/api/v1/risk/point", content=_INSIDE_BODY, headers=_HEADERS)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["catchment_id"] == "c1"
+    assert body["rainfall_event_id"] == "design_2yr"
+    assert 0.0 <= body["max_risk"] <= 1.0
+    assert body["rainfall_intensities"] == [0.0, 10.0, 25.0, 10.0]
+    assert len(db.saved) == 1
+
+
+def test_risk_for_point_outside_catchments_404(client: TestClient, db: DummyDB):
+    resp = client.post("/api/v1/risk/point", content=_OUTSIDE_BODY, headers=_HEADERS)
+    assert resp.status_code == 404
+    assert db.saved == []
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 import pytest
 
 from digital_twin.services.risk_algorithm import (
@@ -8,6 +9,9 @@ from digital_twin.services.risk_algorithm import (
     simulate_catchment,
 )
 
+# Hourly timestamps shared by the simulation tests; slice to the series length
+_TS = tuple(f"2025-01-01T{i:02d}:00Z" for i in range(24))
+
 
 def test_q_runoff_m3s_basic():
     # Example: C=0.8, i=25 mm/hr, A=1.5 km^2
@@ -35,9 +39,18 @@ def test_compress_L_for_risk_behavior():
     assert 1.0 < compressed < 5.0
 
 
+def test_helpers_accept_arrays_elementwise():
+    L = np.array([0.0, 0.7, 1.0, 1.8, 20.0])
+    compressed = _compress_L_for_risk(L)
+    risk = risk_from_loading(L, k=3.0)
+    assert isinstance(compressed, np.ndarray) and isinstance(risk, np.ndarray)
+    assert compressed.tolist() == [_compress_L_for_risk(x) for x in L.tolist()]
+    assert risk.tolist() == [risk_from_loading(x, k=3.0) for x in L.tolist()]
+
+
 def test_simulate_catchment_structure_and_monotonicity():
     rain = [0.0, 5.0, 10.0, 20.0, 5.0]
-    ts = [f"2025-01-01T0{i}:00Z" for i in range(len(rain))]
+    ts = list(_TS[:len(rain)])
     out = simulate_catchment(rain, ts, C=0.7, A_km2=2.0, Qcap_m3s=3.0)
 
     assert set(out.keys()) == {"series", "max_risk"}
@@ -59,3 +72,25 @@ def test_simulate_catchment_structure_and_monotonicity():
     # around the increasing segments
     series = out["series"]
     assert series[0]["R"] <= series[1]["R"] <= series[2]["R"]
+
+
+def test_simulate_catchment_matches_scalar_helpers():
+    rain = [0.0, 12.5, 80.0, 3.0]
+    ts = list(_TS[:len(rain)])
+    # Zero capacity falls back to the tiny floor capacity -> saturated loading
+    out = simulate_catchment(rain, ts, C=0.8, A_km2=1.5, Qcap_m3s=0.0)
+
+    for row, i in zip(out["series"], rain):
+        q = q_runoff_m3s(0.8, i, 1.5)
+        L = q / 1e-6
+        assert row["Qrunoff"] == round(q, 3)
+        assert row["L"] == round(L, 3)
+        assert row["R"] == round(risk_from_loading(_compress_L_for_risk(L), k=3.0), 3)
+
+
+def test_simulate_catchment_truncates_to_shorter_input():
+    out = simulate_catchment([1.0, 2.0, 3.0], ["a", "b"], C=0.6, A_km2=1.0, Qcap_m3s=1.0)
+    assert [row["t"] for row in out["series"]] == ["a", "b"]
+
+    empty = simulate_catchment([], [], C=0.6, A_km2=1.0, Qcap_m3s=1.0)
+    assert empty == {"series": [], "max_risk": 0.0}
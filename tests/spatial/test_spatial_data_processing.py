@@ -0,0 +1,198 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+shapely = pytest.importorskip("shapely")
+
+from digital_twin.spatial import spatial_data_processing as sdp
+from digital_twin.spatial import spatial_utils
+from digital_twin.spatial.spatial_utils import calculate_pipe_capacity, calculate_pipe_grade
+
+
+def test_cached_stage_hits_until_source_mtime_changes(tmp_path):
+    source = tmp_path / "pipes.geojson"
+    source.write_text("{}")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"run": len(calls)}
+
+    assert sdp._cached_stage(tmp_path, "pipes", [source], compute) == {"run": 1}
+    # Unchanged source: served from the pickle
+    assert sdp._cached_stage(tmp_path, "pipes", [source], compute) == {"run": 1}
+    assert len(calls) == 1
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert sdp._cached_stage(tmp_path, "pipes", [source], compute) == {"run": 2}
+    assert len(calls) == 2
+    # The stale entry for the stage is replaced, not accumulated
+    assert len(list(tmp_path.glob(".cache_pipes_*.pkl"))) == 1
+
+
+def test_cached_stage_rebuilds_on_unreadable_pickle(tmp_path):
+    source = tmp_path / "pipes.geojson"
+    source.write_text("{}")
+    sdp._cached_stage(tmp_path, "pipes", [source], lambda: "old")
+    (cache_file,) = tmp_path.glob(".cache_pipes_*.pkl")
+    cache_file.write_bytes(b"not a pickle")
+
+    assert sdp._cached_stage(tmp_path, "pipes", [source], lambda: "new") == "new"
+
+
+def _pipe(ufi, diameter, length, inv_us, inv_ds, material):
+    return {
+        "type": "Feature",
+        "properties": {
+            "ufi": ufi, "Feat_Diam": diameter, "Feat_Len": length,
+            "Inv_Lvl_US": inv_us, "Inv_Lvl_DS": inv_ds, "Feat_Mat": material,
+        },
+        "geometry": None,
+    }
+
+
+def test_aggregate_pipes_with_location_summary(tmp_path, monkeypatch):
+    materials = {"RC": 0.013, "PVC": 0.010}
+    monkeypatch.setattr(sdp, "load_pipe_materials", lambda: materials)
+    features = [
+        # S1: three-way 450 mm tie for the last two "main" slots; file order
+        # decides, so the steep 450 mm pipe is left out of Qcap
+        _pipe(1, 600, 50, 10.0, 9.0, "RC"),
+        _pipe(1, 450, 40, 10.0, 9.6, "RC"),
+        _pipe(1, 450, 30, 10.0, 9.7, "RC"),
+        _pipe(1, 450, 20, 10.0, 8.0, "RC"),
+        _pipe(1, 300, 10, None, None, "rc"),
+        # Invalid diameter / length / material rows are ignored
+        _pipe(1, 0, 10, 10.0, 9.0, "RC"),
+        _pipe(1, -300, 10, 10.0, 9.0, "RC"),
+        _pipe(1, 375, None, 10.0, 9.0, "RC"),
+        _pipe(1, 375, 5, 10.0, 9.0, ""),
+        # S2: mixed-case and unknown materials, flat and missing inverts
+        _pipe("2", 375, 25, 5.0, 5.0, "pvc"),
+        _pipe("2", 225, 12.5, None, 4.0, "Pvc"),
+        _pipe("2", 300, 8, 3.0, 2.9, "XYZ"),
+        # S3 has no valid pipe and so no summary
+        _pipe(3, None, 10, 1.0, 0.5, "RC"),
+    ]
+    pipes_file = tmp_path / "pipes.geojson"
+    pipes_file.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+    def capacity(diameter, inv_us, inv_ds, length, material):
+        grade = calculate_pipe_grade(inv_us, inv_ds, length)
+        return calculate_pipe_capacity(diameter, grade, material, materials)
+
+    assert sdp.aggregate_pipes_with_location(str(pipes_file)) == {
+        "1": {
+            "pipe_count": 5,
+            "total_length_m": 150.0,
+            "avg_diameter_mm": 450.0,
+            "max_diameter_mm": 600.0,
+            "Qcap_m3s": round(
+                capacity(600, 10.0, 9.0, 50, "RC")
+                + capacity(450, 10.0, 9.6, 40, "RC")
+                + capacity(450, 10.0, 9.7, 30, "RC"), 3),
+        },
+        "2": {
+            "pipe_count": 3,
+            "total_length_m": 45.5,
+            "avg_diameter_mm": 300.0,
+            "max_diameter_mm": 375.0,
+            "Qcap_m3s": round(
+                capacity(375, 5.0, 5.0, 25, "pvc")
+                + capacity(225, None, 4.0, 12.5, "Pvc")
+                + capacity(300, 3.0, 2.9, 8, "XYZ"), 3),
+        },
+    }
+
+
+def test_aggregate_pipes_with_location_rounds_half_way_lengths_like_round(tmp_path, monkeypatch):
+    monkeypatch.setattr(sdp, "load_pipe_materials", lambda: {"RC": 0.013})
+    # 100.5 + 10.115 sums to the double nearest 110.615, which round() takes
+    # down to 110.61 (np.round would give 110.62)
+    features = [
+        _pipe(1, 300, 100.5, 10.0, 9.0, "RC"),
+        _pipe(1, 300, 10.115, 10.0, 9.0, "RC"),
+    ]
+    pipes_file = tmp_path / "pipes.geojson"
+    pipes_file.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+    summary = sdp.aggregate_pipes_with_location(str(pipes_file))
+
+    assert summary["1"]["total_length_m"] == round(100.5 + 10.115, 2) == 110.61
+
+
+def _square(x, y, size):
+    return {
+        "type": "Polygon",
+        "coordinates": [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]],
+    }
+
+
+def _catchment(props, geometry):
+    return {"type": "Feature", "properties": props, "geometry": geometry}
+
+
+def test_extract_then_join_catchments(tmp_path):
+    features = [
+        # Type and management both match; the earlier "urban" rule wins
+        _catchment({"ufi": 1, "catch_name": "A", "catch_norm": 1.234, "type": "Industrial",
+                    "management": "urban council"}, _square(115.0, -32.0, 0.5)),
+        # No rule matches -> join falls back to default_C
+        _catchment({"ufi": 2, "catch_name": "B", "catch_norm": 2.0, "type": "Park"},
+                   _square(116.0, -32.0, 1.0)),
+        # Geometry that does not parse to a usable shape -> no centroid
+        _catchment({"ufi": 3, "catch_name": "C", "catch_norm": 3.0, "type": "Rural"},
+                   {"type": "Polygon", "coordinates": []}),
+        # Missing geometry and non-positive area are dropped at extraction
+        _catchment({"ufi": 4, "catch_name": "D", "catch_norm": 4.0}, None),
+        _catchment({"ufi": 5, "catch_name": "E", "catch_norm": 0}, _square(117.0, -32.0, 1.0)),
+    ]
+    catchments_file = tmp_path / "catchments.geojson"
+    catchments_file.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+    catchments = sdp.extract_catchments_with_geometry(str(catchments_file))
+    assert list(catchments) == ["1", "2", "3"]
+    assert [c["C_override"] for c in catchments.values()] == [0.8, None, 0.3]
+    assert catchments["1"]["_shp"].equals(shapely.geometry.shape(features[0]["geometry"]))
+    assert catchments["1"]["A_km2"] == 1.23
+
+    pipes = {
+        key: {"Qcap_m3s": 0.5, "pipe_count": 2, "total_length_m": 10.0, "max_diameter_mm": 300.0}
+        for key in ("1", "2", "3", "4")
+    }
+    joined = sdp.join_pipes_catchments(pipes, catchments, default_C=0.55)
+
+    assert [r["catchment_id"] for r in joined] == ["1", "2", "3"]
+    assert [r["C"] for r in joined] == [0.8, 0.55, 0.3]
+    # Centroids are [lat, lon]
+    assert joined[0]["centroid"] == pytest.approx([-31.75, 115.25])
+    assert joined[1]["centroid"] == pytest.approx([-31.5, 116.5])
+    assert joined[2]["centroid"] == [None, None]
+    for record in joined:
+        assert "_shp" not in record and "C_override" not in record
+    assert joined[0]["geometry"] == features[0]["geometry"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("records", [
+    [],
+    [{"catchment_id": "Mündijong", "名前": "Ōtautahi", "C": 0.5}],
+    [
+        {"catchment_id": "A", "A_km2": np.float64(1.25), "pipe_count": np.int64(3)},
+        {"catchment_id": "B", "A_km2": np.float32(0.5), "pipe_count": np.int32(0)},
+    ],
+])
+def test_save_results_compact_round_trips(tmp_path, monkeypatch, records, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(spatial_utils, "orjson", None)
+    out = tmp_path / "out.json"
+
+    sdp.save_results(records, str(out), pretty=False)
+
+    expected = [{k: (v.item() if isinstance(v, np.generic) else v) for k, v in r.items()} for r in records]
+    assert json.loads(out.read_text(encoding="utf-8")) == expected
@@ -1,3 +1,5 @@
+import math
+import numpy as np
 import pytest
 
 geopandas = pytest.importorskip("geopandas")
@@ -5,25 +7,52 @@ shapely = pytest.importorskip("shapely")
 
 from digital_twin.spatial.spatial_utils import (
     calculate_pipe_grade,
+    calculate_pipe_grade_vec,
     calculate_pipe_capacity,
+    calculate_pipe_capacity_vec,
     calculate_catchment_centroid,
+    calculate_catchment_centroids,
     find_catchment_for_point,
+    find_catchments_for_points,
+    load_catchments_gdf,
+    _load_pipe_materials_cached,
 )
 
 
-def test_calculate_pipe_grade_typical_and_guards():
-    # Typical positive grade
-    assert calculate_pipe_grade(10.0, 9.0, 100.0) == pytest.approx(1.0)
+@pytest.mark.parametrize(
+    "inv_us, inv_ds, length, expected",
+    [
+        (10.0, 9.0, 100.0, 1.0),     # typical positive grade
+        (9.0, 10.0, 100.0, 0.1),     # negative grade coerced to nominal 0.1%
+        (9.0, 9.0, 25.0, 0.1),       # flat grade coerced to nominal 0.1%
+        (10.0, 9.0, 0.0, None),      # zero length invalid
+        (10.0, 9.0, 0.005, None),    # too-short length invalid
+        (60.0, 0.0, 100.0, 50.0),    # extremely large slopes capped at 50%
+        (None, 9.0, 100.0, None),    # missing inputs
+        (10.0, None, 100.0, None),
+        (10.0, 9.0, None, None),
+    ],
+)
+def test_calculate_pipe_grade_typical_and_guards(inv_us, inv_ds, length, expected):
+    grade = calculate_pipe_grade(inv_us, inv_ds, length)
+    if expected is None:
+        assert grade is None
+    else:
+        assert grade == pytest.approx(expected)
 
-    # Zero/negative computed grade coerced to nominal 0.1%
-    assert calculate_pipe_grade(9.0, 10.0, 100.0) == 0.1
 
-    # Too small or invalid lengths return None
-    assert calculate_pipe_grade(10.0, 9.0, 0.0) is None
-    assert calculate_pipe_grade(10.0, 9.0, 0.005) is None
+def test_calculate_pipe_grade_vec_matches_scalar():
+    inv_us = [10.0, 9.0, 10.0, 10.0, 60.0, None, "bad"]
+    inv_ds = [9.0, 10.0, 9.0, 9.0, 0.0, 9.0, 9.0]
+    lengths = [100.0, 100.0, 0.0, 0.005, 100.0, 100.0, 100.0]
 
-    # Extremely large slopes capped at 50%
-    assert calculate_pipe_grade(60.0, 0.0, 100.0) == 50.0
+    grades = calculate_pipe_grade_vec(inv_us, inv_ds, lengths)
+    for got, us, ds, length in zip(grades, inv_us, inv_ds, lengths):
+        expected = calculate_pipe_grade(us, ds, length)
+        if expected is None:
+            assert math.isnan(got)
+        else:
+            assert got == pytest.approx(expected)
 
 
 def test_calculate_pipe_capacity_material_and_slope_handling():
@@ -43,6 +72,44 @@ def test_calculate_pipe_capacity_material_and_slope_handling():
     assert cap_none > 0
 
 
+def test_calculate_pipe_capacity_matches_explicit_manning():
+    # Q = A * (1/n) * R^(2/3) * S^(1/2) with A = pi r^2, R = A / (pi D)
+    d = 0.6
+    area = math.pi * (d / 2.0) ** 2
+    hydraulic_radius = area / (math.pi * d)
+    expected = area * (1.0 / 0.013) * hydraulic_radius ** (2.0 / 3.0) * 0.01 ** 0.5
+
+    cap = calculate_pipe_capacity(600.0, slope=1.0, material="RC", materials={"RC": 0.013})
+    assert cap == pytest.approx(expected, rel=1e-12)
+
+
+def test_calculate_pipe_capacity_vec_matches_scalar():
+    materials = {"RC": 0.013, "PVC": 0.011}
+    diameters = [300.0, 600.0, 900.0, 450.0]
+    slopes = [1.0, -499.5, 0.0, 2.5]
+    codes = ["RC", "pvc", "RC", "UNKNOWN"]
+
+    caps = calculate_pipe_capacity_vec(diameters, slopes, codes, materials)
+    expected = [
+        calculate_pipe_capacity(d, s, m, materials)
+        for d, s, m in zip(diameters, slopes, codes)
+    ]
+    assert caps.tolist() == pytest.approx(expected, rel=1e-12)
+
+
+def test_load_pipe_materials_normalises_and_memoises(tmp_path):
+    path = tmp_path / "PipeMaterials.json"
+    path.write_text(
+        '{"rc": {"manning_n": 0.013}, "PVC": {"manning_n": 0.011}, "UNK": {"manning_n": null}}',
+        encoding="utf-8",
+    )
+
+    mapping = _load_pipe_materials_cached(str(path))
+    assert mapping == {"RC": 0.013, "PVC": 0.011}
+    # Second call for the same path is served from the cache
+    assert _load_pipe_materials_cached(str(path)) is mapping
+
+
 def test_calculate_catchment_centroid_square():
     geom = {
         "type": "Polygon",
@@ -55,6 +122,22 @@ def test_calculate_catchment_centroid_square():
     assert lon == pytest.approx(115.5, rel=0, abs=1e-6)
 
 
+def test_calculate_catchment_centroids_batch_matches_scalar():
+    square = {
+        "type": "Polygon",
+        "coordinates": [[
+            [115.0, -32.0], [116.0, -32.0], [116.0, -31.0], [115.0, -31.0], [115.0, -32.0]
+        ]],
+    }
+    broken = {"type": "Polygon", "coordinates": "not-coordinates"}
+    empty = {"type": "Polygon", "coordinates": []}
+
+    centroids = calculate_catchment_centroids([square, broken, empty])
+    assert centroids[0] == pytest.approx(calculate_catchment_centroid(square))
+    assert centroids[1] == [None, None]
+    assert centroids[2] == [None, None]
+
+
 def test_find_catchment_for_point_contains_and_none():
     poly_a = {
         "type": "Polygon",
@@ -81,3 +164,76 @@ def test_find_catchment_for_point_contains_and_none():
     # Point outside both
     rec2 = find_catchment_for_point(catchments, lon=114.0, lat=-30.0)
     assert rec2 is None
+
+
+def test_find_catchment_for_point_prefers_smallest_nested():
+    outer = {
+        "type": "Polygon",
+        "coordinates": [[[115.0, -32.0], [116.0, -32.0], [116.0, -31.0], [115.0, -31.0], [115.0, -32.0]]],
+    }
+    inner = {
+        "type": "Polygon",
+        "coordinates": [[[115.2, -31.8], [115.4, -31.8], [115.4, -31.6], [115.2, -31.6], [115.2, -31.8]]],
+    }
+    catchments = [
+        {"catchment_id": "outer", "A_km2": 10.0, "geometry": outer},
+        {"catchment_id": "inner", "A_km2": 0.5, "geometry": inner},
+    ]
+
+    rec = find_catchment_for_point(catchments, lon=115.3, lat=-31.7)
+    assert rec["catchment_id"] == "inner"
+    # Source GeoJSON is returned verbatim
+    assert rec["geometry"] is inner
+
+    rec2 = find_catchment_for_point(catchments, lon=115.9, lat=-31.1)
+    assert rec2["catchment_id"] == "outer"
+
+
+def test_load_catchments_gdf_skips_missing_geometry():
+    poly = {
+        "type": "Polygon",
+        "coordinates": [[[115.0, -32.0], [115.5, -32.0], [115.5, -31.5], [115.0, -31.5], [115.0, -32.0]]],
+    }
+    catchments = [
+        {"catchment_id": "A", "A_km2": 1.0, "geometry": poly},
+        {"catchment_id": "B", "A_km2": 2.0, "geometry": None},
+    ]
+
+    gdf = load_catchments_gdf(catchments)
+    assert list(gdf["catchment_id"]) == ["A"]
+    assert gdf.crs.to_epsg() == 4326
+
+
+def test_find_catchments_for_points_batch_matches_scalar():
+    outer = {
+        "type": "Polygon",
+        "coordinates": [[[115.0, -32.0], [116.0, -32.0], [116.0, -31.0], [115.0, -31.0], [115.0, -32.0]]],
+    }
+    inner = {
+        "type": "Polygon",
+        "coordinates": [[[115.2, -31.8], [115.4, -31.8], [115.4, -31.6], [115.2, -31.6], [115.2, -31.8]]],
+    }
+    catchments = [
+        {"catchment_id": "outer", "A_km2": 10.0, "geometry": outer},
+        {"catchment_id": "inner", "A_km2": 0.5, "geometry": inner},
+    ]
+    lons = [115.3, 115.9, 114.0]
+    lats = [-31.7, -31.1, -30.0]
+
+    batch = find_catchments_for_points(catchments, lons, lats)
+    assert [r and r["catchment_id"] for r in batch] == ["inner", "outer", None]
+    assert batch == [find_catchment_for_point(catchments, lon, lat) for lon, lat in zip(lons, lats)]
+
+
+def test_calculate_pipe_grade_vec_large_batch():
+    rng = np.random.default_rng(0)
+    inv_us = rng.uniform(0.0, 20.0, 1000)
+    inv_ds = rng.uniform(0.0, 20.0, 1000)
+    lengths = rng.choice([0.0, 0.005, 1.0, 25.0, 100.0], 1000)
+
+    grades = calculate_pipe_grade_vec(inv_us, inv_ds, lengths)
+    assert grades.shape == (1000,)
+    expected = [calculate_pipe_grade(u, d, l) for u, d, l in zip(inv_us, inv_ds, lengths)]
+    assert np.array_equal(np.isnan(grades), [e is None for e in expected])
+    valid = ~np.isnan(grades)
+    assert grades[valid] == pytest.approx([e for e in expected if e is not None])